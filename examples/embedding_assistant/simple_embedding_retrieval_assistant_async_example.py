@@ -5,6 +5,7 @@ import uuid
 from pathlib import Path
 
 import chromadb
+import numpy as np
 from chromadb import Collection
 from llama_index.embeddings.openai import OpenAIEmbedding
 from simple_embedding_retrieval_assistant import SimpleEmbeddingRetrievalAssistant
@@ -20,6 +21,9 @@ event_store = container.event_store
 CURRENT_DIR = Path(__file__).parent
 PERSIST_DIR = CURRENT_DIR / "storage"
 
+# Number of documents written to Chroma per collection.add call
+ADD_BATCH_SIZE = 200
+
 # Delete the PERSIST_DIR and all files in it
 if os.path.exists(PERSIST_DIR):
     shutil.rmtree(PERSIST_DIR)
@@ -38,7 +42,12 @@ def get_embedding_model() -> OpenAIEmbedding:
     return OpenAIEmbedding(api_key=api_key)
 
 
-def create_collection(document_path: Path = CURRENT_DIR / "data") -> Collection:
+def read_document(file_path: Path) -> str:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+async def create_collection(document_path: Path = CURRENT_DIR / "data") -> Collection:
     # Create a persistent client
     client = chromadb.PersistentClient(path=str(PERSIST_DIR))
 
@@ -59,29 +68,38 @@ def create_collection(document_path: Path = CURRENT_DIR / "data") -> Collection:
             metadatas = []
             ids = []
 
-            for i, file_path in enumerate(document_path.glob("*.*")):
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read().strip()
-                        if content:  # Skip empty documents
-                            documents.append(content)
-                            metadatas.append({"source": str(file_path.name)})
-                            ids.append(f"doc_{i}")
-                except Exception as e:
-                    print(f"Error reading file {file_path}: {e}")
+            # Read all files concurrently instead of one after another
+            file_paths = list(document_path.glob("*.*"))
+            contents = await asyncio.gather(
+                *[asyncio.to_thread(read_document, p) for p in file_paths],
+                return_exceptions=True,
+            )
+
+            for i, (file_path, content) in enumerate(zip(file_paths, contents)):
+                if isinstance(content, Exception):
+                    print(f"Error reading file {file_path}: {content}")
+                elif content:  # Skip empty documents
+                    documents.append(content)
+                    metadatas.append({"source": str(file_path.name)})
+                    ids.append(f"doc_{i}")
 
             # Add documents to collection if there are any
             if documents:
-                # Embed documents
-                embeddings = [embed_model.get_text_embedding(doc) for doc in documents]
-
-                # Add documents with embeddings to the collection
-                collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids,
-                    embeddings=embeddings,
+                # Embed documents, the batches are sent concurrently
+                embeddings = np.asarray(
+                    await embed_model.aget_text_embedding_batch(documents),
+                    dtype=np.float32,
                 )
+
+                # Add documents with embeddings to the collection in batches
+                for start in range(0, len(documents), ADD_BATCH_SIZE):
+                    end = start + ADD_BATCH_SIZE
+                    collection.add(
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end],
+                        embeddings=embeddings[start:end],
+                    )
                 print(f"Added {len(documents)} documents to the collection")
 
     return collection
@@ -94,7 +112,7 @@ async def test_simple_embedding_retrieval_tool_async():
         .name("SimpleEmbeddingRetrievalAssistant")
         .api_key(api_key)
         .embedding_model(get_embedding_model())
-        .collection(create_collection())
+        .collection(await create_collection())
         .build()
     )
 
@@ -4,6 +4,7 @@ import uuid
 from pathlib import Path
 
 import chromadb
+import numpy as np
 from chromadb import Collection
 from llama_index.embeddings.openai import OpenAIEmbedding
 from simple_embedding_retrieval_assistant import SimpleEmbeddingRetrievalAssistant
@@ -17,6 +18,9 @@ api_key = os.getenv("OPENAI_API_KEY")
 CURRENT_DIR = Path(__file__).parent
 PERSIST_DIR = CURRENT_DIR / "storage"
 
+# Number of documents written to Chroma per collection.add call
+ADD_BATCH_SIZE = 200
+
 event_store = container.event_store
 
 # Delete the PERSIST_DIR and all files in it
@@ -71,16 +75,20 @@ def create_collection(document_path: Path = CURRENT_DIR / "data") -> Collection:
 
             # Add documents to collection if there are any
             if documents:
-                # Embed documents
-                embeddings = [embed_model.get_text_embedding(doc) for doc in documents]
-
-                # Add documents with embeddings to the collection
-                collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids,
-                    embeddings=embeddings,
+                # Embed documents in batches rather than one request per document
+                embeddings = np.asarray(
+                    embed_model.get_text_embedding_batch(documents), dtype=np.float32
                 )
+
+                # Add documents with embeddings to the collection in batches
+                for start in range(0, len(documents), ADD_BATCH_SIZE):
+                    end = start + ADD_BATCH_SIZE
+                    collection.add(
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end],
+                        embeddings=embeddings[start:end],
+                    )
                 print(f"Added {len(documents)} documents to the collection")
 
     return collection
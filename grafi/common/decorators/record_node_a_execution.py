@@ -95,7 +95,10 @@ def record_node_a_execution(func):
                 else:
                     result = []
                     async for data in async_result:
-                        result.extend(data if isinstance(data, list) else [data])
+                        if type(data) is list:
+                            result.extend(data)
+                        else:
+                            result.append(data)
                         yield data
 
                 output_data_dict = json.dumps(result, default=to_jsonable_python)
@@ -45,6 +45,10 @@ class EventStore:
         # record events to the store
         raise NotImplementedError
 
+    def flush(self) -> None:
+        """Persist any buffered events, a no-op for stores that write immediately."""
+        pass
+
     def clear_events(self) -> None:
         """Clear all events."""
         raise NotImplementedError
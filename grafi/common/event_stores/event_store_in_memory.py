@@ -1,6 +1,7 @@
 """Module for storing and managing events."""
 
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, ValuesView
 
 from grafi.common.event_stores.event_store import EventStore
 from grafi.common.events.event import Event
@@ -9,47 +10,55 @@ from grafi.common.events.event import Event
 class EventStoreInMemory(EventStore):
     """Stores and manages events in memory by default."""
 
-    events: List[Event] = []
-
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize the event store."""
-        self.events = []
+        # Keyed by event ID, dicts preserve insertion order
+        self.events: Dict[str, Event] = {}
+        # Secondary indexes of event IDs per assistant request and conversation
+        self._request_event_ids: Dict[str, List[str]] = defaultdict(list)
+        self._conversation_event_ids: Dict[str, List[str]] = defaultdict(list)
 
     def record_event(self, event: Event) -> None:
         """Record an event to the store."""
-        self.events.append(event)
+        if event.event_id not in self.events:
+            execution_context = event.execution_context
+            self._request_event_ids[execution_context.assistant_request_id].append(
+                event.event_id
+            )
+            self._conversation_event_ids[execution_context.conversation_id].append(
+                event.event_id
+            )
+        self.events[event.event_id] = event
 
     def record_events(self, events: List[Event]) -> None:
         """Record events to the store."""
-        self.events.extend(events)
+        for event in events:
+            self.record_event(event)
 
     def clear_events(self) -> None:
         """Clear all events."""
         self.events.clear()
+        self._request_event_ids.clear()
+        self._conversation_event_ids.clear()
 
     def get_events(self) -> List[Event]:
         """Get all events."""
-        return self.events.copy()
+        return list(self.events.values())
+
+    def get_events_view(self) -> ValuesView[Event]:
+        """Get a read-only view of all events without copying them."""
+        return self.events.values()
 
     def get_event(self, event_id: str) -> Optional[Event]:
         """Get an event by ID."""
-        for event in self.events:
-            if event.event_id == event_id:
-                return event
-        return None
+        return self.events.get(event_id)
 
     def get_agent_events(self, assistant_request_id: str) -> List[Event]:
         """Get all events for a given agent request ID."""
-        return [
-            event
-            for event in self.events
-            if event.execution_context.assistant_request_id == assistant_request_id
-        ]
+        event_ids = self._request_event_ids.get(assistant_request_id, [])
+        return [self.events[event_id] for event_id in event_ids]
 
     def get_conversation_events(self, conversation_id: str) -> List[Event]:
         """Get all events for a given conversation ID."""
-        return [
-            event
-            for event in self.events
-            if event.execution_context.conversation_id == conversation_id
-        ]
+        event_ids = self._conversation_event_ids.get(conversation_id, [])
+        return [self.events[event_id] for event_id in event_ids]
@@ -1,12 +1,11 @@
 import json
 from typing import Any, Dict, List
 
-from pydantic import TypeAdapter
 from pydantic_core import to_jsonable_python
 
 from grafi.common.events.assistant_events.assistant_event import AssistantEvent
 from grafi.common.events.event import EventType
-from grafi.common.models.message import Message
+from grafi.common.models.message import MESSAGE_LIST_ADAPTER, Message
 
 
 class AssistantInvokeEvent(AssistantEvent):
@@ -26,7 +25,5 @@ class AssistantInvokeEvent(AssistantEvent):
         base_event = cls.assistant_event_base(data)
         return cls(
             **base_event.model_dump(),
-            input_data=TypeAdapter(List[Message]).validate_python(
-                json.loads(data["data"]["input_data"])
-            ),
+            input_data=MESSAGE_LIST_ADAPTER.validate_json(data["data"]["input_data"]),
         )
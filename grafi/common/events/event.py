@@ -60,7 +60,8 @@ class Event(BaseModel):
         return event_id, event_type, timestamp
 
     def to_dict(self) -> Dict[str, Any]:
-        # Return a dictionary representation of the event
+        # Return a new dictionary representation of the event on every call, so
+        # callers may change it without affecting the event
         raise NotImplementedError
 
     def from_dict(cls, data: Dict[str, Any]) -> "Event":
@@ -1,45 +1,55 @@
 """Module for handling node response events in the workflow system."""
 
-import json
+from functools import cached_property
 from typing import Any, Dict, List, Union
 
-from pydantic import TypeAdapter
-from pydantic_core import to_jsonable_python
+from pydantic import ConfigDict
+from pydantic_core import from_json, to_json
 
 from grafi.common.events.event import EventType
 from grafi.common.events.node_events.node_event import NodeEvent
 from grafi.common.events.topic_events.consume_from_topic_event import (
     ConsumeFromTopicEvent,
 )
-from grafi.common.models.message import Message
+from grafi.common.models.message import MESSAGE_DATA_ADAPTER, Message
 
 
 class NodeRespondEvent(NodeEvent):
     """Represents a node response event in the workflow system."""
 
+    model_config = ConfigDict(frozen=True)
+
     event_type: EventType = EventType.NODE_RESPOND
     input_data: List[ConsumeFromTopicEvent]
     output_data: Union[Message, List[Message]]
 
+    @cached_property
+    def _serialized_output_data(self) -> bytes:
+        return to_json(self.output_data)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             **self.node_event_dict(),
             "data": {
                 "input_data": [event.to_dict() for event in self.input_data],
-                "output_data": json.dumps(self.output_data, default=to_jsonable_python),
+                "output_data": from_json(self._serialized_output_data),
             },
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "NodeRespondEvent":
         base_event = cls.node_event_base(data)
+        output_data = data["data"]["output_data"]
+        # Events stored before output data was kept as a plain object hold a string
+        if isinstance(output_data, str):
+            output_data = MESSAGE_DATA_ADAPTER.validate_json(output_data)
+        else:
+            output_data = MESSAGE_DATA_ADAPTER.validate_python(output_data)
         return cls(
             **base_event.model_dump(),
             input_data=[
                 ConsumeFromTopicEvent.from_dict(event)
                 for event in data["data"]["input_data"]
             ],
-            output_data=TypeAdapter(List[Message]).validate_python(
-                json.loads(data["data"]["output_data"])
-            ),
+            output_data=output_data,
         )
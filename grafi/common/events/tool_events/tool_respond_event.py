@@ -1,12 +1,11 @@
 import json
 from typing import Any, Dict, List, Union
 
-from pydantic import TypeAdapter
 from pydantic_core import to_jsonable_python
 
 from grafi.common.events.event import EventType
 from grafi.common.events.tool_events.tool_event import ToolEvent
-from grafi.common.models.message import Message
+from grafi.common.models.message import MESSAGE_DATA_ADAPTER, Message
 
 
 class ToolRespondEvent(ToolEvent):
@@ -26,21 +25,8 @@ class ToolRespondEvent(ToolEvent):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ToolRespondEvent":
         base_event = cls.tool_event_base(data)
-        input_data_dict = json.loads(data["data"]["input_data"])
-        if isinstance(input_data_dict, list):
-            input_data = TypeAdapter(List[Message]).validate_python(
-                json.loads(data["data"]["input_data"])
-            )
-        else:
-            input_data = Message.model_validate(input_data_dict)
-
-        output_data_dict = json.loads(data["data"]["output_data"])
-        if isinstance(output_data_dict, list):
-            output_data = TypeAdapter(List[Message]).validate_python(
-                json.loads(data["data"]["output_data"])
-            )
-        else:
-            output_data = Message.model_validate(output_data_dict)
+        input_data = MESSAGE_DATA_ADAPTER.validate_json(data["data"]["input_data"])
+        output_data = MESSAGE_DATA_ADAPTER.validate_json(data["data"]["output_data"])
 
         return cls(
             **base_event.model_dump(),
@@ -1,27 +1,33 @@
-import json
-from typing import Any, Dict, List, Union
+from functools import cached_property
+from typing import Any, Dict, List, Tuple, Union
 
-from pydantic import TypeAdapter
-from pydantic_core import to_jsonable_python
+from pydantic import ConfigDict
+from pydantic_core import from_json, to_json
 
 from grafi.common.events.event import EVENT_CONTEXT, EventType
 from grafi.common.events.topic_events.topic_event import TopicEvent
 from grafi.common.models.execution_context import ExecutionContext
-from grafi.common.models.message import Message
+from grafi.common.models.message import MESSAGE_DATA_ADAPTER, Message
 
 
 class PublishToTopicEvent(TopicEvent):
-    consumed_event_ids: List[str] = []
+    model_config = ConfigDict(frozen=True)
+
+    consumed_event_ids: Tuple[str, ...] = ()
     publisher_name: str
     publisher_type: str
     event_type: EventType = EventType.PUBLISH_TO_TOPIC
 
     data: Union[Message, List[Message]]
 
+    @cached_property
+    def _serialized_data(self) -> bytes:
+        return to_json(self.data)
+
     def to_dict(self):
 
         event_context = {
-            "consumed_event_ids": self.consumed_event_ids,
+            "consumed_event_ids": list(self.consumed_event_ids),
             "publisher_name": self.publisher_name,
             "publisher_type": self.publisher_type,
             "topic_name": self.topic_name,
@@ -32,7 +38,7 @@ class PublishToTopicEvent(TopicEvent):
         return {
             EVENT_CONTEXT: event_context,
             **super().event_dict(),
-            "data": json.dumps(self.data, default=to_jsonable_python),
+            "data": from_json(self._serialized_data),
         }
 
     @classmethod
@@ -41,11 +47,11 @@ class PublishToTopicEvent(TopicEvent):
             data[EVENT_CONTEXT]["execution_context"]
         )
 
-        data_dict = json.loads(data["data"])
-        if isinstance(data_dict, list):
-            data_obj = TypeAdapter(List[Message]).validate_python(data_dict)
+        # Events stored before data was kept as a plain object hold a JSON string
+        if isinstance(data["data"], str):
+            data_obj = MESSAGE_DATA_ADAPTER.validate_json(data["data"])
         else:
-            data_obj = Message.model_validate(data_dict)
+            data_obj = MESSAGE_DATA_ADAPTER.validate_python(data["data"])
 
         base_event = cls.event_base(data)
         return cls(
@@ -1,12 +1,11 @@
 import json
 from typing import Any, Dict, List, Union
 
-from pydantic import TypeAdapter
 from pydantic_core import to_jsonable_python
 
 from grafi.common.events.event import EventType
 from grafi.common.events.workflow_events.workflow_event import WorkflowEvent
-from grafi.common.models.message import Message
+from grafi.common.models.message import MESSAGE_DATA_ADAPTER, Message
 
 
 class WorkflowFailedEvent(WorkflowEvent):
@@ -26,11 +25,7 @@ class WorkflowFailedEvent(WorkflowEvent):
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "WorkflowFailedEvent":
         base_event = cls.workflow_event_base(data)
-        input_data_dict = json.loads(data["data"]["input_data"])
-        if isinstance(input_data_dict, list):
-            input_data = TypeAdapter(List[Message]).validate_python(input_data_dict)
-        else:
-            input_data = Message.model_validate(input_data_dict)
+        input_data = MESSAGE_DATA_ADAPTER.validate_json(data["data"]["input_data"])
         return cls(
             **base_event.model_dump(),
             input_data=input_data,
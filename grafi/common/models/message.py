@@ -3,7 +3,7 @@ from typing import Any, Dict, Iterable, List, Literal, Optional, Union
 
 from openai.types.chat.chat_completion import ChatCompletionMessage
 from openai.types.chat.chat_completion_tool_param import ChatCompletionToolParam
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 from typing_extensions import Literal
 
 from grafi.common.models.default_id import default_id
@@ -22,3 +22,10 @@ class Message(ChatCompletionMessage):
     role: Literal["system", "user", "assistant", "tool"]
     tool_call_id: Optional[str] = None
     tools: Optional[Iterable[ChatCompletionToolParam]] = None
+
+
+# Validators are costly to build, so they are created once and shared
+MESSAGE_LIST_ADAPTER: TypeAdapter[List[Message]] = TypeAdapter(List[Message])
+MESSAGE_DATA_ADAPTER: TypeAdapter[Union[Message, List[Message]]] = TypeAdapter(
+    Union[Message, List[Message]]
+)
@@ -1,10 +1,12 @@
 """Module for LLM-related node implementations."""
 
-from typing import AsyncGenerator, List
+from collections import OrderedDict
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 
 from loguru import logger
+from openai.types.chat.chat_completion_tool_param import ChatCompletionToolParam
 from openinference.semconv.trace import OpenInferenceSpanKindValues
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from grafi.common.containers.container import container
 from grafi.common.decorators.record_node_a_execution import record_node_a_execution
@@ -14,12 +16,16 @@ from grafi.common.events.topic_events.consume_from_topic_event import (
     ConsumeFromTopicEvent,
 )
 from grafi.common.events.topic_events.publish_to_topic_event import PublishToTopicEvent
+from grafi.common.events.topic_events.topic_event import TopicEvent
 from grafi.common.models.execution_context import ExecutionContext
 from grafi.common.models.function_spec import FunctionSpec
 from grafi.common.models.message import Message
 from grafi.nodes.node import Node
 from grafi.tools.llms.llm_response_command import LLMResponseCommand
 
+# Maximum number of assistant requests whose topic events are kept per node
+TOPIC_EVENTS_CACHE_SIZE = 256
+
 
 class LLMNode(Node):
     """Node for interacting with a Language Model (LLM)."""
@@ -30,6 +36,14 @@ class LLMNode(Node):
     command: LLMResponseCommand = Field(default=None)
     function_specs: List[FunctionSpec] = Field(default=[])
 
+    # OpenAI tool definitions built from function_specs, reset when a spec is added
+    _function_tools: Optional[List[ChatCompletionToolParam]] = PrivateAttr(default=None)
+
+    # assistant_request_id -> (IDs of the agent events seen, topic events)
+    _topic_events_cache: "OrderedDict[str, Tuple[List[str], Dict[str, TopicEvent]]]" = (
+        PrivateAttr(default_factory=OrderedDict)
+    )
+
     class Builder(Node.Builder):
         """Concrete builder for LLMNode."""
 
@@ -39,6 +53,51 @@ class LLMNode(Node):
     def add_function_spec(self, function_spec: FunctionSpec) -> None:
         """Add a function specification to the node."""
         self.function_specs.append(function_spec)
+        self._function_tools = None
+
+    def get_function_tools(self) -> List[ChatCompletionToolParam]:
+        """Get the function specifications as OpenAI tools, built once and reused."""
+        if self._function_tools is None:
+            self._function_tools = [
+                spec.to_openai_tool() for spec in self.function_specs
+            ]
+        return self._function_tools
+
+    def get_topic_events(self, assistant_request_id: str) -> Dict[str, TopicEvent]:
+        """
+        Get the topic events of an assistant request keyed by event ID.
+
+        The result is cached per request, and later calls only filter the agent
+        events recorded since the previous call. The cache is rebuilt when the
+        stored events no longer start with the ones seen before.
+        """
+        agent_events = container.event_store.get_agent_events(assistant_request_id)
+
+        start = 0
+        event_ids: List[str] = []
+        topic_events: Dict[str, TopicEvent] = {}
+        cached = self._topic_events_cache.pop(assistant_request_id, None)
+        if cached is not None:
+            seen_event_ids, cached_topic_events = cached
+            if [
+                event.event_id for event in agent_events[: len(seen_event_ids)]
+            ] == seen_event_ids:
+                start = len(seen_event_ids)
+                event_ids = seen_event_ids
+                topic_events = cached_topic_events
+
+        # EventGraph looks up consumed events by ID, so keep the dict keyed by event ID
+        for event in agent_events[start:]:
+            event_ids.append(event.event_id)
+            if isinstance(event, (ConsumeFromTopicEvent, PublishToTopicEvent)):
+                topic_events[event.event_id] = event
+
+        if agent_events:
+            self._topic_events_cache[assistant_request_id] = (event_ids, topic_events)
+            if len(self._topic_events_cache) > TOPIC_EVENTS_CACHE_SIZE:
+                self._topic_events_cache.popitem(last=False)
+
+        return topic_events
 
     @record_node_execution
     def execute(
@@ -60,36 +119,26 @@ class LLMNode(Node):
         return response
 
     @record_node_a_execution
-    async def a_execute(
+    def a_execute(
         self,
         execution_context: ExecutionContext,
         node_input: List[ConsumeFromTopicEvent],
     ) -> AsyncGenerator[Message, None]:
         logger.debug(f"Executing LLMNode with inputs: {node_input}")
 
-        response = self.command.a_execute(
+        # Return the LLM's response generator as is, the decorator already iterates it
+        # and re-yielding each message here would only add a suspension per token
+        return self.command.a_execute(
             execution_context,
             input_data=self.get_command_input(execution_context, node_input),
         )
 
-        # Use the LLM's execute method to get the response generator
-        async for message in response:
-            yield message
-
     def get_command_input(
         self,
         execution_context: ExecutionContext,
         node_input: List[ConsumeFromTopicEvent],
     ) -> List[Message]:
-        agent_events = container.event_store.get_agent_events(
-            execution_context.assistant_request_id
-        )
-        topic_events = {
-            event.event_id: event
-            for event in agent_events
-            if isinstance(event, ConsumeFromTopicEvent)
-            or isinstance(event, PublishToTopicEvent)
-        }
+        topic_events = self.get_topic_events(execution_context.assistant_request_id)
         event_graph = EventGraph()
         event_graph.build_graph(node_input, topic_events)
 
@@ -104,37 +153,44 @@ class LLMNode(Node):
         ]
 
         # Make sure the llm tool call message are followed by the function call messages
-        # Step 1: get all the messages with tool_call_id and remove them from the messages list
-        tool_call_messages = {
-            msg.tool_call_id: msg for msg in messages if msg.tool_call_id is not None
-        }
-        messages = [msg for msg in messages if msg.tool_call_id is None]
-
-        # Step 2: loop over the messages again, find the llm messages with tool_calls, and append corresponding the tool_call_messages
-        i = 0
-        while i < len(messages):
-            if messages[i].tool_calls:
-                for tool_call in messages[i].tool_calls:
-                    if tool_call.id in tool_call_messages:
-                        messages.insert(i + 1, tool_call_messages[tool_call.id])
-                    else:
+        # Step 1: split the messages with tool_call_id from the rest in a single pass
+        tool_call_messages: Dict[str, Message] = {}
+        other_messages: List[Message] = []
+        has_tool_calls = False
+        for msg in messages:
+            if msg.tool_call_id is None:
+                other_messages.append(msg)
+                if msg.tool_calls:
+                    has_tool_calls = True
+            else:
+                tool_call_messages[msg.tool_call_id] = msg
+
+        # Step 2: rebuild the list in one pass, placing the tool_call_messages right after the llm message with the matching tool_calls.
+        # Without any tool calls there is nothing to reorder, and the dangling tool messages are dropped
+        if not has_tool_calls:
+            messages = other_messages
+        else:
+            ordered_messages: List[Message] = []
+            append = ordered_messages.append
+            pop_tool_call_message = tool_call_messages.pop
+            for message in other_messages:
+                append(message)
+                for tool_call in message.tool_calls or ():
+                    tool_call_message = pop_tool_call_message(tool_call.id, None)
+                    if tool_call_message is None:
                         logger.warning(
                             f"Tool call message not found for id: {tool_call.id}, add an empty message"
                         )
-                        message_args = {
-                            "role": "tool",
-                            "content": None,
-                            "tool_call_id": tool_call.id,
-                        }
-                        messages.insert(i + 1, Message(**message_args))
-                i += len(messages[i].tool_calls) + 1
-            else:
-                i += 1
+                        tool_call_message = Message(
+                            role="tool", content=None, tool_call_id=tool_call.id
+                        )
+                    append(tool_call_message)
+            messages = ordered_messages
 
         # Attach function specs to the last message
         if self.function_specs and messages:
             last_message = messages[-1]
-            last_message.tools = [spec.to_openai_tool() for spec in self.function_specs]
+            last_message.tools = self.get_function_tools()
 
         return messages
 
@@ -170,7 +170,9 @@ class FunctionTool(Tool):
                         **json.loads(tool_call.function.arguments),
                     )
                 else:
-                    response = func(
+                    # Run blocking functions in a worker thread to keep the event loop free
+                    response = await asyncio.to_thread(
+                        func,
                         self,
                         **json.loads(tool_call.function.arguments),
                     )
@@ -1,7 +1,12 @@
+import asyncio
+import heapq
 from collections import deque
-from typing import Any, Dict, List
+from operator import attrgetter
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Union
 
 from openinference.semconv.trace import OpenInferenceSpanKindValues
+from pydantic import Field, PrivateAttr
+from pydantic_core import from_json, to_json
 
 from grafi.common.containers.container import container
 from grafi.common.decorators.record_workflow_a_execution import (
@@ -23,6 +28,7 @@ from grafi.common.models.message import Message
 from grafi.common.topics.human_request_topic import HumanRequestTopic
 from grafi.common.topics.output_topic import AGENT_OUTPUT_TOPIC
 from grafi.common.topics.topic import AGENT_INPUT_TOPIC, Topic
+from grafi.common.topics.topic_base import TopicBase
 from grafi.common.topics.topic_expression import extract_topics
 from grafi.nodes.impl.llm_function_call_node import LLMFunctionCallNode
 from grafi.nodes.impl.llm_node import LLMNode
@@ -46,19 +52,29 @@ class EventDrivenWorkflow(Workflow):
     oi_span_type: OpenInferenceSpanKindValues = OpenInferenceSpanKindValues.AGENT
 
     # All nodes that belong to this workflow, keyed by node name
-    nodes: Dict[str, Node] = {}
+    nodes: Dict[str, Node] = Field(default_factory=dict)
 
     # Topics known to this workflow (e.g., "agent_input", "agent_stream_output")
-    topics: Dict[str, Topic] = {}
+    topics: Dict[str, Topic] = Field(default_factory=dict)
 
     # Mapping of topic_name -> list of node_names that subscribe to that topic
-    topic_nodes: Dict[str, List[str]] = {}
+    topic_nodes: Dict[str, List[str]] = Field(default_factory=dict)
 
     # Execution context for this run
     execution_context: ExecutionContext = None
 
     # Queue of nodes that are ready to execute (in response to published events)
-    execution_queue: deque[Node] = deque()
+    execution_queue: deque[Node] = Field(default_factory=deque)
+
+    # Names of the nodes in the execution queue, so a node is queued only once
+    _queued_node_names: Set[str] = PrivateAttr(default_factory=set)
+
+    # Position of each node in the topological order of the node graph
+    _node_rank: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    # Serialized workflow as JSON bytes, decoded into a fresh dict by to_dict. Only
+    # the builder clears it, so nodes and topics must not change once built
+    _dict_cache: Optional[bytes] = PrivateAttr(default=None)
 
     # Optional callback that handles output events
     # Including agent output event, stream event and hil event
@@ -66,7 +82,7 @@ class EventDrivenWorkflow(Workflow):
     class Builder(Workflow.Builder):
         """Concrete builder for EventDrivenWorkflow."""
 
-        def __init__(self):
+        def __init__(self) -> None:
             self._workflow = self._init_workflow()
 
         def _init_workflow(self) -> "EventDrivenWorkflow":
@@ -82,6 +98,7 @@ class EventDrivenWorkflow(Workflow):
             if node.name in self._workflow.nodes:
                 raise DuplicateNodeError(node.name)
             self._workflow.nodes[node.name] = node
+            self._workflow._dict_cache = None
             return self
 
         def build(self) -> "EventDrivenWorkflow":
@@ -90,11 +107,17 @@ class EventDrivenWorkflow(Workflow):
             Sets up topic subscriptions and node-to-topic mappings.
             """
 
+            # Expressions are unhashable models, so topics found in an expression shared
+            # by several nodes are memoized by the expression's identity
+            expr_topics: Dict[int, List[TopicBase]] = {}
+
             # 1) Gather all topics from node subscriptions/publishes
             for node_name, node in self._workflow.nodes.items():
                 # For each subscription expression, parse out one or more topics
                 for expr in node.subscribed_expressions:
-                    found_topics = extract_topics(expr)
+                    found_topics = expr_topics.get(id(expr))
+                    if found_topics is None:
+                        found_topics = expr_topics[id(expr)] = extract_topics(expr)
                     for t in found_topics:
                         self._add_topic(t)
                         self._workflow.topic_nodes.setdefault(t.name, []).append(
@@ -121,6 +144,10 @@ class EventDrivenWorkflow(Workflow):
             # 3) For any function-calling nodes, link them with the LLM nodes that produce their inputs
             self._handle_function_calling_nodes()
 
+            # 4) Rank the nodes topologically, so subscribers are queued upstream first
+            self._rank_nodes()
+
+            self._workflow._dict_cache = None
             return self._workflow
 
         def _add_topic(self, topic: Topic) -> None:
@@ -133,7 +160,69 @@ class EventDrivenWorkflow(Workflow):
                 topic.publish_event_handler = self._workflow.on_event
                 self._workflow.topics[topic.name] = topic
 
-        def _handle_function_calling_nodes(self):
+        def _rank_nodes(self) -> None:
+            """
+            Compute the topological order of the nodes, following the edges from each
+            node to the subscribers of the topics it publishes to. A DFS from the agent
+            input subscribers, then from the remaining nodes, finds the edges closing a
+            cycle (e.g. a function call node feeding its LLM node back), which are
+            ignored. Nodes left unordered by the other edges keep their registration
+            order.
+            """
+            nodes = self._workflow.nodes
+            topic_nodes = self._workflow.topic_nodes
+            node_names = list(nodes)
+            registration_index = {name: index for index, name in enumerate(node_names)}
+
+            # Keep the edges that do not point back into the current search path
+            edges: Dict[str, List[str]] = {name: [] for name in node_names}
+            visited: Set[str] = set()
+            search_path: Set[str] = set()
+
+            def visit(node_name: str) -> None:
+                visited.add(node_name)
+                search_path.add(node_name)
+                for topic in nodes[node_name].publish_to:
+                    for subscriber_name in topic_nodes.get(topic.name, []):
+                        if subscriber_name in search_path:
+                            continue
+                        edges[node_name].append(subscriber_name)
+                        if subscriber_name not in visited:
+                            visit(subscriber_name)
+                search_path.remove(node_name)
+
+            for node_name in [*topic_nodes.get(AGENT_INPUT_TOPIC, []), *node_names]:
+                if node_name not in visited:
+                    visit(node_name)
+
+            # Kahn's algorithm, taking the earliest registered node among the ready ones
+            in_degree = {name: 0 for name in node_names}
+            for subscriber_names in edges.values():
+                for subscriber_name in subscriber_names:
+                    in_degree[subscriber_name] += 1
+            ready = [
+                registration_index[name]
+                for name, degree in in_degree.items()
+                if degree == 0
+            ]
+            heapq.heapify(ready)
+
+            node_rank: Dict[str, int] = {}
+            while ready:
+                node_name = node_names[heapq.heappop(ready)]
+                node_rank[node_name] = len(node_rank)
+                for subscriber_name in edges[node_name]:
+                    in_degree[subscriber_name] -= 1
+                    if in_degree[subscriber_name] == 0:
+                        heapq.heappush(ready, registration_index[subscriber_name])
+
+            self._workflow._node_rank = node_rank
+            # Keep the nodes in the same order, so that neighbours are iterated together
+            self._workflow.nodes = {name: nodes[name] for name in node_rank}
+            for subscriber_names in topic_nodes.values():
+                subscriber_names.sort(key=node_rank.__getitem__)
+
+        def _handle_function_calling_nodes(self) -> None:
             """
             If there are LLMFunctionCallNode(s), we link them with the LLMNode(s)
             that publish to the same topic, so that the LLM can carry the function specs.
@@ -147,13 +236,12 @@ class EventDrivenWorkflow(Workflow):
 
             # Map each topic -> the nodes that publish to it
             published_topics_to_nodes: Dict[str, List[LLMNode]] = {}
-
-            published_topics_to_nodes = {
-                topic.name: [node]
-                for node in self._workflow.nodes.values()
-                if isinstance(node, LLMNode)
-                for topic in node.publish_to
-            }
+            for node in self._workflow.nodes.values():
+                if isinstance(node, LLMNode):
+                    for topic in node.publish_to:
+                        published_topics_to_nodes.setdefault(topic.name, []).append(
+                            node
+                        )
 
             # If a function node subscribes to a topic that an LLMNode publishes to,
             # we add the function specs to the LLM node.
@@ -168,15 +256,17 @@ class EventDrivenWorkflow(Workflow):
         self,
         node: Node,
         execution_context: ExecutionContext,
-        result: List[Message],
+        result: Union[List[Message], AsyncGenerator[Message, None]],
         consumed_events: List[ConsumeFromTopicEvent],
     ) -> None:
-        published_events = []
+        published_events: List[PublishToTopicEvent] = []
+        node_name = node.name
+        node_type = node.type
         for topic in node.publish_to:
             event = topic.publish_data(
                 execution_context=execution_context,
-                publisher_name=node.name,
-                publisher_type=node.type,
+                publisher_name=node_name,
+                publisher_type=node_type,
                 data=result,
                 consumed_events=consumed_events,
             )
@@ -198,6 +288,7 @@ class EventDrivenWorkflow(Workflow):
         # Process nodes until execution queue is empty
         while self.execution_queue:
             node = self.execution_queue.popleft()
+            self._queued_node_names.discard(node.name)
 
             # Given node, collect all the messages can be linked to it
 
@@ -207,7 +298,9 @@ class EventDrivenWorkflow(Workflow):
 
             # Execute node with collected inputs
             if node_consumed_events:
-                result = node.execute(execution_context, node_consumed_events)
+                result: List[Message] = node.execute(
+                    execution_context, node_consumed_events
+                )
 
                 self._publish_events(
                     node, execution_context, result, node_consumed_events
@@ -223,91 +316,130 @@ class EventDrivenWorkflow(Workflow):
         """
         self.initial_workflow(execution_context, input)
 
-        # Process nodes until execution queue is empty
+        # Process nodes until execution queue is empty, the nodes that are ready
+        # at the same time run concurrently
         while self.execution_queue:
-            node = self.execution_queue.popleft()
+            ready_nodes: List[Node] = list(self.execution_queue)
+            self.execution_queue.clear()
+            self._queued_node_names.clear()
 
-            # Given node, collect all the messages can be linked to it
+            tasks = [
+                asyncio.create_task(self._a_execute_node(node, execution_context))
+                for node in ready_nodes
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # Cancel the nodes still running, so that none of them publishes
+                # into the workflow after this run failed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+    async def _a_execute_node(
+        self, node: Node, execution_context: ExecutionContext
+    ) -> None:
+        # Given node, collect all the messages can be linked to it
+        node_consumed_events: List[ConsumeFromTopicEvent] = self.get_node_input(node)
 
-            node_consumed_events: List[ConsumeFromTopicEvent] = self.get_node_input(
-                node
-            )
+        # Execute node with collected inputs
+        if not node_consumed_events:
+            return
 
-            # Execute node with collected inputs
-            if node_consumed_events:
-                if isinstance(node.command, LLMStreamResponseCommand):
-                    # Stream node usually would be the last node of the workflow which will return to user.
-                    # In this case we return the async generator to the caller
-                    result = node.a_execute(execution_context, node_consumed_events)
+        result: Union[List[Message], AsyncGenerator[Message, None]]
+        if isinstance(node.command, LLMStreamResponseCommand):
+            # Stream node usually would be the last node of the workflow which will return to user.
+            # In this case we return the async generator to the caller
+            result = node.a_execute(execution_context, node_consumed_events)
+        else:
+            # Extract data from async generator and publish the data to the topic
+            result = []
+            async for item in node.a_execute(execution_context, node_consumed_events):
+                if type(item) is list:
+                    result.extend(item)
                 else:
-                    # Extract data from async generator and publish the data to the topic
-                    result = []
-                    async for item in node.a_execute(
-                        execution_context, node_consumed_events
-                    ):
-                        result.extend(item if isinstance(item, list) else [item])
+                    result.append(item)
 
-                self._publish_events(
-                    node, execution_context, result, node_consumed_events
-                )
+        self._publish_events(node, execution_context, result, node_consumed_events)
 
     def get_node_input(self, node: Node) -> List[ConsumeFromTopicEvent]:
         consumed_events: List[ConsumeFromTopicEvent] = []
 
         node_subscribed_topics = node._subscribed_topics.values()
+        node_name = node.name
+        node_type = node.type
 
-        # Process each topic the node is subscribed to
+        # Process each topic the node is subscribed to. Topics keep the consumption
+        # offset of every node, and consume returns nothing when the node is up to date,
+        # so there is no need to probe them with can_consume first
         for subscribed_topic in node_subscribed_topics:
-            if subscribed_topic.can_consume(node.name):
-                # Get messages from topic and create consume events
-                node_consumed_events = subscribed_topic.consume(node.name)
-                for event in node_consumed_events:
-                    consumed_event = ConsumeFromTopicEvent(
-                        execution_context=event.execution_context,
-                        topic_name=event.topic_name,
-                        consumer_name=node.name,
-                        consumer_type=node.type,
-                        offset=event.offset,
-                        data=event.data,
-                    )
-                    consumed_events.append(consumed_event)
+            # Get messages from topic and create consume events
+            node_consumed_events = subscribed_topic.consume(node_name)
+            for event in node_consumed_events:
+                # Regular construction is kept over model_construct: validation runs in
+                # pydantic-core and does not revalidate the nested model instances, while
+                # model_construct fills the defaults in Python and measures ~3x slower
+                consumed_event = ConsumeFromTopicEvent(
+                    execution_context=event.execution_context,
+                    topic_name=event.topic_name,
+                    consumer_name=node_name,
+                    consumer_type=node_type,
+                    offset=event.offset,
+                    data=event.data,
+                )
+                consumed_events.append(consumed_event)
 
         return consumed_events
 
     def on_event(self, event: TopicEvent) -> None:
         """Handle topic publish events and trigger node execution if conditions are met."""
-        if not isinstance(event, PublishToTopicEvent):
-            return
-
-        if isinstance(event, OutputTopicEvent):
-            return
-
-        topic_name = event.topic_name
-        if topic_name not in self.topic_nodes:
+        # Plain publish events, the common case, are matched by identity without walking
+        # the MRO. Output events are a kind of publish event that subscribers ignore
+        event_class = event.__class__
+        if event_class is not PublishToTopicEvent and (
+            not issubclass(event_class, PublishToTopicEvent)
+            or issubclass(event_class, OutputTopicEvent)
+        ):
             return
 
         # Get all nodes subscribed to this topic
-        subscribed_nodes = self.topic_nodes[topic_name]
+        if not (subscribed_nodes := self.topic_nodes.get(event.topic_name)):
+            return
 
+        nodes = self.nodes
+        queued_node_names = self._queued_node_names
         for node_name in subscribed_nodes:
-            node = self.nodes[node_name]
+            # A queued node consumes all of its new messages when it runs
+            if node_name in queued_node_names:
+                continue
+            node = nodes[node_name]
             # Check if node has new messages to consume
             if node.can_execute():
-                self.execution_queue.append(node)
+                self._enqueue_node(node)
+
+    def _enqueue_node(self, node: Node) -> None:
+        """Add the node to the execution queue unless it is already waiting there."""
+        if node.name not in self._queued_node_names:
+            self._queued_node_names.add(node.name)
+            self.execution_queue.append(node)
 
     def initial_workflow(
         self, execution_context: ExecutionContext, input: List[Message]
     ) -> Any:
         """Restore the workflow state from stored events."""
 
+        event_store = container.event_store
+        topics = self.topics
+
         # Reset all the topics
 
-        for topic in self.topics.values():
+        for topic in topics.values():
             topic.reset()
 
         events = [
             event
-            for event in container.event_store.get_agent_events(
+            for event in event_store.get_agent_events(
                 execution_context.assistant_request_id
             )
             if isinstance(event, (PublishToTopicEvent, ConsumeFromTopicEvent))
@@ -316,32 +448,29 @@ class EventDrivenWorkflow(Workflow):
         if len(events) == 0:
             # Get all the assistant respond events given converstion id as workflow input
 
-            conversation_events = container.event_store.get_conversation_events(
+            conversation_events = event_store.get_conversation_events(
                 execution_context.conversation_id
             )
 
-            assistant_respond_event_dict = {
-                event.event_id: event
-                for event in conversation_events
-                if isinstance(event, AssistantRespondEvent)
-            }
-
-            # Get all the input and output message from assistant respond events as list
+            # Get all the input and output message from assistant respond events as list,
+            # the event stores hold each event ID once so no deduplication is needed
             all_messages: List[Message] = []
-            for event in assistant_respond_event_dict.values():
-                all_messages.extend(event.input_data)
-                all_messages.extend(event.output_data)
+            for event in conversation_events:
+                if isinstance(event, AssistantRespondEvent):
+                    all_messages.extend(event.input_data)
+                    all_messages.extend(event.output_data)
 
-            # Sort the messages by timestamp
+            # Sort the messages by timestamp, each respond event adds a run that is
+            # usually already ordered, which the sort merges cheaply
             sorted_messages: List[Message] = sorted(
-                all_messages, key=lambda item: item.timestamp
+                all_messages, key=attrgetter("timestamp")
             )
 
             # Add the input data from the current assistant input
             sorted_messages.extend(input)
 
             # Initialize by publish input data to input topic
-            input_topic = self.topics.get(AGENT_INPUT_TOPIC)
+            input_topic = topics.get(AGENT_INPUT_TOPIC)
             event = input_topic.publish_data(
                 execution_context=execution_context,
                 publisher_name=self.name,
@@ -349,29 +478,32 @@ class EventDrivenWorkflow(Workflow):
                 data=sorted_messages,
                 consumed_events=[],
             )
-            container.event_store.record_event(event)
+            event_store.record_event(event)
         else:
             # When there is unfinished workflow, we need to restore the workflow topics
             for event in events:
-                self.topics[event.topic_name].restore_topic(event)
+                topics[event.topic_name].restore_topic(event)
 
             publish_events = [
                 event for event in events if isinstance(event, PublishToTopicEvent)
             ]
             # restore the topics
 
+            topic_nodes = self.topic_nodes
+            nodes = self.nodes
+            # Events produced while restoring are recorded together once restored
+            user_input_events: List[PublishToTopicEvent] = []
             for publish_event in publish_events:
                 topic_name = publish_event.topic_name
-                if topic_name not in self.topic_nodes:
-                    continue
-
-                topic = self.topics[topic_name]
 
                 # Get all nodes subscribed to this topic
-                subscribed_nodes = self.topic_nodes[topic_name]
+                if not (subscribed_nodes := topic_nodes.get(topic_name)):
+                    continue
+
+                topic = topics[topic_name]
 
                 for node_name in subscribed_nodes:
-                    node = self.nodes[node_name]
+                    node = nodes[node_name]
                     # add unprocessed node to the execution queue
                     if topic.can_consume(node_name) and node.can_execute():
                         if isinstance(
@@ -382,16 +514,28 @@ class EventDrivenWorkflow(Workflow):
                                 user_input_event=publish_event,
                                 data=input,
                             )
-                            container.event_store.record_event(event)
-                        self.execution_queue.append(node)
+                            if event:
+                                user_input_events.append(event)
+                        self._enqueue_node(node)
+
+            if user_input_events:
+                event_store.record_events(user_input_events)
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            **super().to_dict(),
-            "name": self.name,
-            "type": self.type,
-            "oi_span_type": self.oi_span_type.value,
-            "nodes": {name: node.to_dict() for name, node in self.nodes.items()},
-            "topics": {name: topic.to_dict() for name, topic in self.topics.items()},
-            "topic_nodes": self.topic_nodes,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = to_json(
+                {
+                    **super().to_dict(),
+                    "name": self.name,
+                    "type": self.type,
+                    "oi_span_type": self.oi_span_type.value,
+                    "nodes": {
+                        name: node.to_dict() for name, node in self.nodes.items()
+                    },
+                    "topics": {
+                        name: topic.to_dict() for name, topic in self.topics.items()
+                    },
+                    "topic_nodes": self.topic_nodes,
+                }
+            )
+        return from_json(self._dict_cache)
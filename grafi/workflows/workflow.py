@@ -1,7 +1,7 @@
 from typing import Any, Dict, List, Tuple
 
 from openinference.semconv.trace import OpenInferenceSpanKindValues
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from grafi.common.events.event import Event
 from grafi.common.events.node_events.node_event import NodeEvent
@@ -19,8 +19,8 @@ class Workflow(BaseModel):
     workflow_id: str = default_id
     name: str
     type: str
-    nodes: Dict[str, Node] = {}
-    state: Dict[str, Tuple[str, NodeEvent | None]] = {}
+    nodes: Dict[str, Node] = Field(default_factory=dict)
+    state: Dict[str, Tuple[str, NodeEvent | None]] = Field(default_factory=dict)
 
     class Builder:
         """Inner builder class for workflow construction."""
@@ -0,0 +1,31 @@
+from typing import Callable
+
+import pytest
+
+from grafi.common.events.topic_events.publish_to_topic_event import PublishToTopicEvent
+from grafi.common.models.execution_context import ExecutionContext
+from grafi.common.models.message import Message
+
+
+@pytest.fixture
+def make_event() -> Callable[..., PublishToTopicEvent]:
+    def make_event(
+        event_id: str,
+        assistant_request_id: str = "assistant_request_id",
+        conversation_id: str = "conversation_id",
+    ) -> PublishToTopicEvent:
+        return PublishToTopicEvent(
+            event_id=event_id,
+            topic_name="test_topic",
+            publisher_name="test_node",
+            publisher_type="test_type",
+            offset=0,
+            execution_context=ExecutionContext(
+                conversation_id=conversation_id,
+                execution_id="execution_id",
+                assistant_request_id=assistant_request_id,
+            ),
+            data=[Message(role="user", content="Hello")],
+        )
+
+    return make_event
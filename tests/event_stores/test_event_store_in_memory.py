@@ -0,0 +1,77 @@
+import pytest
+
+from grafi.common.event_stores.event_store_in_memory import EventStoreInMemory
+
+
+@pytest.fixture
+def event_store() -> EventStoreInMemory:
+    return EventStoreInMemory()
+
+
+def test_record_event(event_store: EventStoreInMemory, make_event):
+    event = make_event("event_1")
+    event_store.record_event(event)
+
+    assert event_store.get_events() == [event]
+    assert event_store.get_event("event_1") == event
+    assert event_store.get_event("missing") is None
+
+
+def test_record_events_preserves_order(event_store: EventStoreInMemory, make_event):
+    events = [make_event(f"event_{i}") for i in range(5)]
+    event_store.record_events(events)
+
+    assert event_store.get_events() == events
+
+
+def test_get_agent_events(event_store: EventStoreInMemory, make_event):
+    event_1 = make_event("event_1", assistant_request_id="request_1")
+    event_2 = make_event("event_2", assistant_request_id="request_2")
+    event_3 = make_event("event_3", assistant_request_id="request_1")
+    event_store.record_events([event_1, event_2, event_3])
+
+    assert event_store.get_agent_events("request_1") == [event_1, event_3]
+    assert event_store.get_agent_events("request_2") == [event_2]
+    assert event_store.get_agent_events("missing") == []
+
+
+def test_get_conversation_events(event_store: EventStoreInMemory, make_event):
+    event_1 = make_event("event_1", conversation_id="conversation_1")
+    event_2 = make_event("event_2", conversation_id="conversation_2")
+    event_store.record_event(event_1)
+    event_store.record_event(event_2)
+
+    assert event_store.get_conversation_events("conversation_1") == [event_1]
+    assert event_store.get_conversation_events("conversation_2") == [event_2]
+
+
+def test_clear_events(event_store: EventStoreInMemory, make_event):
+    event_store.record_events([make_event("event_1"), make_event("event_2")])
+    event_store.clear_events()
+
+    assert len(event_store.get_events()) == 0
+    assert event_store.get_event("event_1") is None
+    assert event_store.get_agent_events("assistant_request_id") == []
+    assert event_store.get_conversation_events("conversation_id") == []
+
+
+def test_record_event_twice_is_indexed_once(
+    event_store: EventStoreInMemory, make_event
+):
+    event = make_event("event_1")
+    event_store.record_event(event)
+    event_store.record_event(event)
+
+    assert event_store.get_agent_events("assistant_request_id") == [event]
+    assert event_store.get_conversation_events("conversation_id") == [event]
+
+
+def test_get_events_view(event_store: EventStoreInMemory, make_event):
+    events_view = event_store.get_events_view()
+    assert len(events_view) == 0
+
+    event = make_event("event_1")
+    event_store.record_event(event)
+
+    assert len(events_view) == 1
+    assert list(events_view) == [event]
@@ -0,0 +1,147 @@
+import threading
+import time
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from grafi.common.event_stores import event_store_postgres  # noqa: E402
+from grafi.common.event_stores.event_store_postgres import (  # noqa: E402
+    EventStorePostgres,
+)
+from grafi.common.events.event import Event  # noqa: E402
+
+
+class FakeDatabase:
+    """Stands in for _save_events, rejecting duplicate event ids like the table."""
+
+    def __init__(self):
+        self.event_ids: List[str] = []
+        self.transactions: List[List[str]] = []
+
+    def save_events(self, events: List[Event]) -> None:
+        event_ids = [event.event_id for event in events]
+        self.transactions.append(event_ids)
+        if len(set(event_ids)) < len(event_ids) or set(event_ids) & set(self.event_ids):
+            raise ValueError("duplicate event_id")
+        self.event_ids.extend(event_ids)
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def event_store(database: FakeDatabase):
+    with (
+        patch.object(event_store_postgres, "create_engine"),
+        patch.object(event_store_postgres.Base.metadata, "create_all"),
+        patch.object(EventStorePostgres, "_save_events", new=database.save_events),
+    ):
+        store = EventStorePostgres(
+            "postgresql://test", background_writes=True, batch_size=10
+        )
+        yield store
+        store.close()
+
+
+def test_flush_writes_queued_events(
+    event_store: EventStorePostgres, database: FakeDatabase, make_event
+):
+    event_store.record_events([make_event("event_1"), make_event("event_2")])
+    event_store.record_event(make_event("event_3"))
+
+    event_store.flush()
+
+    assert database.event_ids == ["event_1", "event_2", "event_3"]
+
+
+def test_events_are_written_in_recorded_order(
+    event_store: EventStorePostgres, database: FakeDatabase, make_event
+):
+    # flush() holds the write lock while the writer thread wakes up for event_1,
+    # the writer must not take event_1 ahead of the events flush() writes
+    with event_store._write_lock:
+        event_store.record_event(make_event("event_1"))
+        time.sleep(0.05)
+        event_store.record_event(make_event("event_2"))
+        event_store.record_event(make_event("event_3"))
+        event_store._write_pending_events()
+
+    event_store.flush()
+
+    assert database.event_ids == ["event_1", "event_2", "event_3"]
+
+
+def test_failed_batch_is_retried_row_by_row(
+    event_store: EventStorePostgres, database: FakeDatabase, make_event
+):
+    database.event_ids.append("event_2")
+
+    # Hold the writer back so the events are written together
+    with event_store._write_lock:
+        event_store.record_events(
+            [make_event("event_1"), make_event("event_2"), make_event("event_3")]
+        )
+
+    with pytest.raises(RuntimeError, match="Failed to write 1 queued event"):
+        event_store.flush()
+
+    assert database.event_ids == ["event_2", "event_1", "event_3"]
+    assert database.transactions[0] == ["event_1", "event_2", "event_3"]
+
+
+def test_flush_reports_write_errors_once(
+    event_store: EventStorePostgres, database: FakeDatabase, make_event
+):
+    database.event_ids.append("event_1")
+    event_store.record_event(make_event("event_1"))
+
+    with pytest.raises(RuntimeError):
+        event_store.flush()
+
+    event_store.flush()
+
+
+def test_close_writes_queued_events_and_stops_writer(
+    database: FakeDatabase, make_event
+):
+    with (
+        patch.object(event_store_postgres, "create_engine"),
+        patch.object(event_store_postgres.Base.metadata, "create_all"),
+        patch.object(EventStorePostgres, "_save_events", new=database.save_events),
+    ):
+        store = EventStorePostgres("postgresql://test", background_writes=True)
+        writer = store._writer
+        store.record_events([make_event(f"event_{i}") for i in range(5)])
+
+        store.close()
+
+        assert database.event_ids == [f"event_{i}" for i in range(5)]
+        assert not writer.is_alive()
+
+        # Once closed, events are written directly
+        store.record_events([make_event("event_5")])
+        assert database.event_ids[-1] == "event_5"
+        store.close()
+
+
+def test_concurrent_records_are_all_written(
+    event_store: EventStorePostgres, database: FakeDatabase, make_event
+):
+    def record(start: int):
+        for i in range(start, start + 50):
+            event_store.record_event(make_event(f"event_{i}"))
+
+    threads = [threading.Thread(target=record, args=(i * 50,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    event_store.flush()
+
+    assert sorted(database.event_ids) == sorted(f"event_{i}" for i in range(200))
@@ -84,7 +84,23 @@ def node_failed_event_dict():
                             "user_id": "",
                         },
                     },
-                    "data": '[{"content": "Hello, my name is Grafi, how are you doing?", "refusal": null, "role": "user", "annotations": null, "audio": null, "function_call": null, "tool_calls": null, "name": null, "message_id": "ea72df51439b42e4a43b217c9bca63f5", "timestamp": 1737138526189505000, "tool_call_id": null, "tools": null, "functions": null}]',
+                    "data": [
+                        {
+                            "content": "Hello, my name is Grafi, how are you doing?",
+                            "refusal": None,
+                            "role": "user",
+                            "annotations": None,
+                            "audio": None,
+                            "function_call": None,
+                            "tool_calls": None,
+                            "name": None,
+                            "message_id": "ea72df51439b42e4a43b217c9bca63f5",
+                            "timestamp": 1737138526189505000,
+                            "tool_call_id": None,
+                            "tools": None,
+                            "functions": None,
+                        }
+                    ],
                 }
             ],
             "error": "error",
@@ -103,10 +103,57 @@ def node_respond_event_dict():
                             "user_id": "",
                         },
                     },
-                    "data": '[{"content": "Hello, my name is Grafi, how are you doing?", "refusal": null, "role": "user", "annotations": null, "audio": null, "function_call": null, "tool_calls": null, "name": null, "message_id": "ea72df51439b42e4a43b217c9bca63f5", "timestamp": 1737138526189505000, "tool_call_id": null, "tools": null, "functions": null}]',
+                    "data": [
+                        {
+                            "content": "Hello, my name is Grafi, how are you doing?",
+                            "refusal": None,
+                            "role": "user",
+                            "annotations": None,
+                            "audio": None,
+                            "function_call": None,
+                            "tool_calls": None,
+                            "name": None,
+                            "message_id": "ea72df51439b42e4a43b217c9bca63f5",
+                            "timestamp": 1737138526189505000,
+                            "tool_call_id": None,
+                            "tools": None,
+                            "functions": None,
+                        }
+                    ],
                 }
             ],
-            "output_data": '[{"content": "Hello, my name is Grafi, how are you doing?", "refusal": null, "role": "user", "annotations": null, "audio": null, "function_call": null, "tool_calls": null, "name": null, "message_id": "ea72df51439b42e4a43b217c9bca63f5", "timestamp": 1737138526189505000, "tool_call_id": null, "tools": null, "functions": null}, {"content": "Hello, Grafi, I am doing well, thank you.", "refusal": null, "role": "assistant", "annotations": null, "audio": null, "function_call": null, "tool_calls": null, "name": null, "message_id": "ea72df51439b42e4a43b217c9bca63f6", "timestamp": 1737138526189605000, "tool_call_id": null, "tools": null, "functions": null}]',
+            "output_data": [
+                {
+                    "content": "Hello, my name is Grafi, how are you doing?",
+                    "refusal": None,
+                    "role": "user",
+                    "annotations": None,
+                    "audio": None,
+                    "function_call": None,
+                    "tool_calls": None,
+                    "name": None,
+                    "message_id": "ea72df51439b42e4a43b217c9bca63f5",
+                    "timestamp": 1737138526189505000,
+                    "tool_call_id": None,
+                    "tools": None,
+                    "functions": None,
+                },
+                {
+                    "content": "Hello, Grafi, I am doing well, thank you.",
+                    "refusal": None,
+                    "role": "assistant",
+                    "annotations": None,
+                    "audio": None,
+                    "function_call": None,
+                    "tool_calls": None,
+                    "name": None,
+                    "message_id": "ea72df51439b42e4a43b217c9bca63f6",
+                    "timestamp": 1737138526189605000,
+                    "tool_call_id": None,
+                    "tools": None,
+                    "functions": None,
+                },
+            ],
         },
     }
 
@@ -119,3 +166,16 @@ def test_node_respond_event_to_dict(
 
 def test_node_respond_event_from_dict(node_respond_event_dict, node_respond_event):
     assert NodeRespondEvent.from_dict(node_respond_event_dict) == node_respond_event
+
+
+def test_node_respond_event_single_message_round_trip(
+    node_respond_event: NodeRespondEvent,
+):
+    # Stream nodes respond with a single message instead of a list
+    event = NodeRespondEvent(
+        **node_respond_event.model_dump(exclude={"input_data", "output_data"}),
+        input_data=node_respond_event.input_data,
+        output_data=Message(role="assistant", content="Hello, Grafi"),
+    )
+
+    assert NodeRespondEvent.from_dict(event.to_dict()) == event
@@ -1,4 +1,7 @@
+import json
+
 import pytest
+from pydantic import ValidationError
 
 from grafi.common.events.event import EVENT_CONTEXT
 from grafi.common.events.topic_events.publish_to_topic_event import PublishToTopicEvent
@@ -84,7 +87,23 @@ def publish_to_topic_event_dict():
                 "user_id": "",
             },
         },
-        "data": '[{"content": "Hello, my name is Grafi, how are you doing?", "refusal": null, "role": "user", "annotations": null, "audio": null, "function_call": null, "tool_calls": null, "name": null, "message_id": "ea72df51439b42e4a43b217c9bca63f5", "timestamp": 1737138526189505000, "tool_call_id": null, "tools": null, "functions": null}]',
+        "data": [
+            {
+                "content": "Hello, my name is Grafi, how are you doing?",
+                "refusal": None,
+                "role": "user",
+                "annotations": None,
+                "audio": None,
+                "function_call": None,
+                "tool_calls": None,
+                "name": None,
+                "message_id": "ea72df51439b42e4a43b217c9bca63f5",
+                "timestamp": 1737138526189505000,
+                "tool_call_id": None,
+                "tools": None,
+                "functions": None,
+            }
+        ],
     }
 
 
@@ -108,7 +127,21 @@ def publish_to_topic_event_dict_message():
                 "user_id": "",
             },
         },
-        "data": '{"content": "Hello, my name is Grafi, how are you doing?", "refusal": null, "role": "user", "annotations": null, "audio": null, "function_call": null, "tool_calls": null, "name": null, "message_id": "ea72df51439b42e4a43b217c9bca63f5", "timestamp": 1737138526189505000, "tool_call_id": null, "tools": null, "functions": null}',
+        "data": {
+            "content": "Hello, my name is Grafi, how are you doing?",
+            "refusal": None,
+            "role": "user",
+            "annotations": None,
+            "audio": None,
+            "function_call": None,
+            "tool_calls": None,
+            "name": None,
+            "message_id": "ea72df51439b42e4a43b217c9bca63f5",
+            "timestamp": 1737138526189505000,
+            "tool_call_id": None,
+            "tools": None,
+            "functions": None,
+        },
     }
 
 
@@ -127,6 +160,18 @@ def test_publish_to_topic_event_from_dict(
     )
 
 
+def test_publish_to_topic_event_from_dict_json_string_data(
+    publish_to_topic_event_dict, publish_to_topic_event
+):
+    publish_to_topic_event_dict["data"] = json.dumps(
+        publish_to_topic_event_dict["data"]
+    )
+    assert (
+        PublishToTopicEvent.from_dict(publish_to_topic_event_dict)
+        == publish_to_topic_event
+    )
+
+
 def test_publish_to_topic_event_to_dict_message(
     publish_to_topic_event_message: PublishToTopicEvent,
     publish_to_topic_event_dict_message,
@@ -143,3 +188,19 @@ def test_publish_to_topic_event_from_dict_message(
         PublishToTopicEvent.from_dict(publish_to_topic_event_dict_message)
         == publish_to_topic_event_message
     )
+
+
+def test_publish_to_topic_event_to_dict_returns_copy_of_data(
+    publish_to_topic_event: PublishToTopicEvent,
+):
+    first = publish_to_topic_event.to_dict()
+    first["data"][0]["content"] = "changed"
+    assert publish_to_topic_event.to_dict()["data"][0]["content"] != "changed"
+
+
+def test_publish_to_topic_event_is_frozen(
+    publish_to_topic_event: PublishToTopicEvent,
+    publish_to_topic_event_message: PublishToTopicEvent,
+):
+    with pytest.raises(ValidationError):
+        publish_to_topic_event.data = publish_to_topic_event_message.data
@@ -0,0 +1,284 @@
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from grafi.common.containers.container import container
+from grafi.common.events.node_events.node_invoke_event import NodeInvokeEvent
+from grafi.common.events.node_events.node_respond_event import NodeRespondEvent
+from grafi.common.events.topic_events.consume_from_topic_event import (
+    ConsumeFromTopicEvent,
+)
+from grafi.common.events.topic_events.publish_to_topic_event import PublishToTopicEvent
+from grafi.common.models.execution_context import ExecutionContext
+from grafi.common.models.function_spec import (
+    FunctionSpec,
+    ParameterSchema,
+    ParametersSchema,
+)
+from grafi.common.models.message import Message
+from grafi.nodes.impl.llm_node import LLMNode
+
+
+@pytest.fixture
+def function_spec() -> FunctionSpec:
+    return FunctionSpec(
+        name="get_weather",
+        description="Get the weather for a location",
+        parameters=ParametersSchema(
+            properties={"location": ParameterSchema(type="string")},
+            required=["location"],
+        ),
+    )
+
+
+def get_node_input(
+    execution_context: ExecutionContext, messages: List[Message]
+) -> List[ConsumeFromTopicEvent]:
+    return [
+        ConsumeFromTopicEvent(
+            execution_context=execution_context,
+            topic_name="agent_input_topic",
+            consumer_name="LLMNode",
+            consumer_type="LLMNode",
+            offset=0,
+            data=messages,
+        )
+    ]
+
+
+def test_get_function_tools_is_cached(function_spec: FunctionSpec):
+    node = LLMNode()
+    node.add_function_spec(function_spec)
+
+    tools = node.get_function_tools()
+
+    assert tools == [function_spec.to_openai_tool()]
+    assert node.get_function_tools() is tools
+
+
+def test_add_function_spec_resets_function_tools(function_spec: FunctionSpec):
+    node = LLMNode()
+    node.add_function_spec(function_spec)
+    node.get_function_tools()
+
+    other_spec = function_spec.model_copy(update={"name": "get_time"})
+    node.add_function_spec(other_spec)
+
+    assert [tool["function"]["name"] for tool in node.get_function_tools()] == [
+        "get_weather",
+        "get_time",
+    ]
+
+
+def test_get_command_input_attaches_tools_to_last_message(
+    execution_context: ExecutionContext, function_spec: FunctionSpec
+):
+    container.event_store.clear_events()
+    node = LLMNode()
+    node.add_function_spec(function_spec)
+
+    messages = node.get_command_input(
+        execution_context,
+        get_node_input(
+            execution_context,
+            [
+                Message(role="system", content="You are a helpful assistant."),
+                Message(role="user", content="What is the weather in London?"),
+            ],
+        ),
+    )
+
+    assert [message.role for message in messages] == ["system", "user"]
+    assert messages[0].tools is None
+    assert messages[-1].tools == [function_spec.to_openai_tool()]
+
+
+def get_tool_call(tool_call_id: str) -> dict:
+    return {
+        "id": tool_call_id,
+        "type": "function",
+        "function": {"name": "get_weather", "arguments": '{"location": "London"}'},
+    }
+
+
+def test_get_command_input_places_tool_messages_after_tool_calls(
+    execution_context: ExecutionContext,
+):
+    container.event_store.clear_events()
+    node = LLMNode()
+
+    messages = node.get_command_input(
+        execution_context,
+        get_node_input(
+            execution_context,
+            [
+                Message(role="tool", content="sunny", tool_call_id="call_2"),
+                Message(role="user", content="What is the weather?"),
+                Message(
+                    role="assistant",
+                    tool_calls=[get_tool_call("call_1"), get_tool_call("call_2")],
+                ),
+                Message(role="tool", content="rainy", tool_call_id="call_1"),
+                Message(role="user", content="Thanks"),
+            ],
+        ),
+    )
+
+    assert [(message.role, message.tool_call_id) for message in messages] == [
+        ("user", None),
+        ("assistant", None),
+        ("tool", "call_1"),
+        ("tool", "call_2"),
+        ("user", None),
+    ]
+
+
+def test_get_command_input_adds_empty_message_for_missing_tool_call(
+    execution_context: ExecutionContext,
+):
+    container.event_store.clear_events()
+    node = LLMNode()
+
+    messages = node.get_command_input(
+        execution_context,
+        get_node_input(
+            execution_context,
+            [Message(role="assistant", tool_calls=[get_tool_call("call_1")])],
+        ),
+    )
+
+    assert len(messages) == 2
+    assert messages[1].role == "tool"
+    assert messages[1].tool_call_id == "call_1"
+    assert messages[1].content is None
+
+
+def test_get_command_input_without_tool_calls_keeps_order(
+    execution_context: ExecutionContext,
+):
+    container.event_store.clear_events()
+    node = LLMNode()
+    user_message = Message(role="user", content="Hello")
+    assistant_message = Message(role="assistant", content="Hi")
+
+    messages = node.get_command_input(
+        execution_context,
+        get_node_input(
+            execution_context,
+            [
+                user_message,
+                Message(role="tool", content="sunny", tool_call_id="call_1"),
+                assistant_message,
+            ],
+        ),
+    )
+
+    assert messages == [user_message, assistant_message]
+
+
+def get_publish_event(execution_context: ExecutionContext) -> PublishToTopicEvent:
+    return PublishToTopicEvent(
+        execution_context=execution_context,
+        topic_name="agent_input_topic",
+        publisher_name="test_node",
+        publisher_type="test_type",
+        offset=0,
+        data=[Message(role="user", content="Hello")],
+    )
+
+
+def test_get_topic_events_extends_cached_events(execution_context: ExecutionContext):
+    container.event_store.clear_events()
+    node = LLMNode()
+    publish_event = get_publish_event(execution_context)
+    node_invoke_event = NodeInvokeEvent(
+        execution_context=execution_context,
+        node_name="LLMNode",
+        node_type="LLMNode",
+        input_data=[],
+    )
+    container.event_store.record_events([publish_event, node_invoke_event])
+
+    topic_events = node.get_topic_events(execution_context.assistant_request_id)
+    assert topic_events == {publish_event.event_id: publish_event}
+
+    consume_event = get_node_input(execution_context, publish_event.data)[0]
+    container.event_store.record_event(consume_event)
+
+    assert node.get_topic_events(execution_context.assistant_request_id) == {
+        publish_event.event_id: publish_event,
+        consume_event.event_id: consume_event,
+    }
+
+
+def test_get_topic_events_rebuilds_when_events_change(
+    execution_context: ExecutionContext,
+):
+    container.event_store.clear_events()
+    node = LLMNode()
+    publish_event = get_publish_event(execution_context)
+    container.event_store.record_event(publish_event)
+    node.get_topic_events(execution_context.assistant_request_id)
+
+    container.event_store.clear_events()
+    other_publish_event = get_publish_event(execution_context)
+    container.event_store.record_event(other_publish_event)
+
+    assert node.get_topic_events(execution_context.assistant_request_id) == {
+        other_publish_event.event_id: other_publish_event
+    }
+
+
+@pytest.mark.asyncio
+async def test_a_execute_yields_command_messages(execution_context: ExecutionContext):
+    container.event_store.clear_events()
+    messages = [
+        Message(role="assistant", content="Hello"),
+        Message(role="assistant", content="World"),
+    ]
+
+    async def command_a_execute(execution_context, input_data):
+        for message in messages:
+            yield message
+
+    node = LLMNode()
+    node.command = Mock(a_execute=command_a_execute)
+
+    result = [
+        message
+        async for message in node.a_execute(
+            execution_context,
+            get_node_input(execution_context, [Message(role="user", content="Hi")]),
+        )
+    ]
+
+    assert result == messages
+    respond_event = container.event_store.get_events()[-1]
+    assert isinstance(respond_event, NodeRespondEvent)
+    assert respond_event.output_data == messages
+
+
+def test_get_topic_events_rebuilds_when_earlier_events_change(
+    execution_context: ExecutionContext,
+):
+    container.event_store.clear_events()
+    node = LLMNode()
+    node_invoke_event = NodeInvokeEvent(
+        execution_context=execution_context,
+        node_name="LLMNode",
+        node_type="LLMNode",
+        input_data=[],
+    )
+    publish_event = get_publish_event(execution_context)
+    container.event_store.record_events([publish_event, node_invoke_event])
+    node.get_topic_events(execution_context.assistant_request_id)
+
+    # The last seen event is unchanged, but the events before it are not
+    container.event_store.clear_events()
+    other_publish_event = get_publish_event(execution_context)
+    container.event_store.record_events([other_publish_event, node_invoke_event])
+
+    assert node.get_topic_events(execution_context.assistant_request_id) == {
+        other_publish_event.event_id: other_publish_event
+    }
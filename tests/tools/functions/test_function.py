@@ -1,4 +1,5 @@
 import json
+import threading
 import warnings
 
 import pytest
@@ -86,6 +87,62 @@ def test_execute(function_instance, execution_context):
     assert result[0].content == "hello - 42"
 
 
+@pytest.mark.asyncio
+async def test_a_execute(function_instance, execution_context):
+    input_data = Message(
+        role="assistant",
+        content="",
+        tool_calls=[
+            {
+                "id": "test_id",
+                "type": "function",
+                "function": {
+                    "name": "test_func",
+                    "arguments": json.dumps({"arg1": "hello", "arg2": 42}),
+                },
+            }
+        ],
+    )
+    result = []
+    async for messages in function_instance.a_execute(execution_context, input_data):
+        result.extend(messages)
+    assert result[0].content == "hello - 42"
+    assert result[0].tool_call_id == "test_id"
+
+
+@pytest.mark.asyncio
+async def test_a_execute_runs_sync_function_in_worker_thread(execution_context):
+    thread_ids = []
+
+    class ThreadRecordingFunction(FunctionTool):
+        @llm_function
+        def record_thread(self) -> str:
+            """Record the thread the function runs in.
+
+            Returns:
+                str: The result of the function.
+            """
+            thread_ids.append(threading.get_ident())
+            return "recorded"
+
+    input_data = Message(
+        role="assistant",
+        content="",
+        tool_calls=[
+            {
+                "id": "test_id",
+                "type": "function",
+                "function": {"name": "record_thread", "arguments": "{}"},
+            }
+        ],
+    )
+    async for _ in ThreadRecordingFunction().a_execute(execution_context, input_data):
+        pass
+
+    assert len(thread_ids) == 1
+    assert thread_ids[0] != threading.get_ident()
+
+
 def test_execute_wrong_function_name(function_instance, execution_context):
     input_data = Message(
         role="assistant",
@@ -77,6 +77,17 @@ def test_reset(topic: TopicBase, execution_context: ExecutionContext):
     assert topic.consumption_offsets == {}  # Consumption offsets should be reset
 
 
+def test_reset_empty_topic_keeps_state(topic: TopicBase):
+    """Ensure resetting a topic without state leaves it untouched."""
+    topic_events = topic.topic_events
+    consumption_offsets = topic.consumption_offsets
+
+    topic.reset()
+
+    assert topic.topic_events is topic_events
+    assert topic.consumption_offsets is consumption_offsets
+
+
 def test_restore_topic(topic: TopicBase, execution_context: ExecutionContext):
     """Ensure topic restores correctly from events."""
     event = PublishToTopicEvent(
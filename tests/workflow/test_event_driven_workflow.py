@@ -1,3 +1,5 @@
+import asyncio
+import uuid
 from typing import AsyncGenerator, List
 from unittest.mock import MagicMock, Mock, patch
 
@@ -5,15 +7,28 @@ import pytest
 from openinference.semconv.trace import OpenInferenceSpanKindValues
 from pydantic import Field
 
+from grafi.common.containers.container import container
+from grafi.common.events.assistant_events.assistant_respond_event import (
+    AssistantRespondEvent,
+)
 from grafi.common.events.topic_events.consume_from_topic_event import (
     ConsumeFromTopicEvent,
 )
+from grafi.common.events.topic_events.output_topic_event import OutputTopicEvent
 from grafi.common.events.topic_events.publish_to_topic_event import PublishToTopicEvent
 from grafi.common.models.command import Command
 from grafi.common.models.execution_context import ExecutionContext
+from grafi.common.models.function_spec import (
+    FunctionSpec,
+    ParameterSchema,
+    ParametersSchema,
+)
 from grafi.common.models.message import Message
 from grafi.common.topics.output_topic import AGENT_OUTPUT_TOPIC
 from grafi.common.topics.topic import AGENT_INPUT_TOPIC, Topic
+from grafi.common.topics.topic_expression import TopicExpr
+from grafi.nodes.impl.llm_function_call_node import LLMFunctionCallNode
+from grafi.nodes.impl.llm_node import LLMNode
 from grafi.nodes.node import Node
 from grafi.workflows.impl.event_driven_workflow import EventDrivenWorkflow
 
@@ -111,6 +126,21 @@ class TestEventDrivenWorkflow:
         assert AGENT_INPUT_TOPIC in simple_workflow.topics
         assert AGENT_OUTPUT_TOPIC in simple_workflow.topics
 
+    def test_workflows_do_not_share_state(self):
+        """Test each workflow gets its own nodes, topics and execution queue"""
+        first_workflow = EventDrivenWorkflow()
+        second_workflow = EventDrivenWorkflow()
+
+        first_workflow.nodes["test_node"] = MockNode()
+        first_workflow.topics[AGENT_INPUT_TOPIC] = Topic(name=AGENT_INPUT_TOPIC)
+        first_workflow.topic_nodes[AGENT_INPUT_TOPIC] = ["test_node"]
+        first_workflow.execution_queue.append(MockNode())
+
+        assert second_workflow.nodes == {}
+        assert second_workflow.topics == {}
+        assert second_workflow.topic_nodes == {}
+        assert len(second_workflow.execution_queue) == 0
+
     @patch("grafi.common.containers.container.container")
     def test_on_event_handler(self, mock_container, simple_workflow):
         """Test event handler functionality"""
@@ -125,6 +155,26 @@ class TestEventDrivenWorkflow:
         assert len(simple_workflow.execution_queue) == 1
         assert simple_workflow.execution_queue[0].name == "test_node"
 
+    def test_on_event_ignores_output_and_consume_events(self, simple_workflow):
+        """Test only publish events that are not output events queue nodes"""
+        for event_class in [OutputTopicEvent, ConsumeFromTopicEvent]:
+            mock_event = MagicMock(spec=event_class)
+            mock_event.topic_name = AGENT_INPUT_TOPIC
+
+            simple_workflow.on_event(mock_event)
+
+        assert len(simple_workflow.execution_queue) == 0
+
+    def test_on_event_queues_node_once(self, simple_workflow):
+        """Test a node triggered again before it runs is queued only once"""
+        mock_event = MagicMock(spec=PublishToTopicEvent)
+        mock_event.topic_name = AGENT_INPUT_TOPIC
+
+        simple_workflow.on_event(mock_event)
+        simple_workflow.on_event(mock_event)
+
+        assert len(simple_workflow.execution_queue) == 1
+
     def test_builder_functionality(self, mock_input_topic, mock_output_topic):
         """Test the workflow builder functionality"""
         builder = EventDrivenWorkflow.Builder()
@@ -140,3 +190,301 @@ class TestEventDrivenWorkflow:
         # Verify workflow was built correctly
         assert len(workflow.nodes) == 1
         assert mock_node.name in workflow.nodes
+
+    @pytest.mark.asyncio
+    async def test_a_execute_runs_ready_nodes_concurrently(self):
+        """Test nodes that are ready at the same time run concurrently"""
+        container.event_store.clear_events()
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        first_node_started = asyncio.Event()
+
+        class WaitingNode(MockNode):
+            async def a_execute(self, execution_context, node_input):
+                # Only completes if the other node runs while this one is waiting
+                await asyncio.wait_for(first_node_started.wait(), timeout=1)
+                yield Message(role="assistant", content="waited")
+
+        class SignalingNode(MockNode):
+            async def a_execute(self, execution_context, node_input):
+                first_node_started.set()
+                yield Message(role="assistant", content="signaled")
+
+        builder = EventDrivenWorkflow.Builder()
+        for node in [
+            WaitingNode(name="waiting_node"),
+            SignalingNode(name="signaling_node"),
+        ]:
+            node.subscribed_expressions = [TopicExpr(topic=input_topic)]
+            node._subscribed_topics = {AGENT_INPUT_TOPIC: input_topic}
+            node.publish_to = [Topic(name=f"{node.name}_topic")]
+            builder.node(node)
+        workflow = builder.build()
+
+        await workflow.a_execute(
+            ExecutionContext(
+                conversation_id="conversation_id",
+                execution_id="execution_id",
+                assistant_request_id=uuid.uuid4().hex,
+            ),
+            [Message(role="user", content="Hello")],
+        )
+
+        assert [
+            event.data[0].content
+            for event in workflow.topics["waiting_node_topic"].topic_events
+        ] == ["waited"]
+        assert [
+            event.data[0].content
+            for event in workflow.topics["signaling_node_topic"].topic_events
+        ] == ["signaled"]
+
+    @pytest.mark.asyncio
+    async def test_a_execute_cancels_running_nodes_when_a_node_fails(self):
+        """Test a failing node cancels its siblings before the error is raised"""
+        container.event_store.clear_events()
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        slow_node_started = asyncio.Event()
+        slow_node_cancelled = asyncio.Event()
+
+        class FailingNode(MockNode):
+            async def a_execute(self, execution_context, node_input):
+                await slow_node_started.wait()
+                raise ValueError("boom")
+                yield
+
+        class SlowNode(MockNode):
+            async def a_execute(self, execution_context, node_input):
+                slow_node_started.set()
+                try:
+                    await asyncio.sleep(0.2)
+                except asyncio.CancelledError:
+                    slow_node_cancelled.set()
+                    raise
+                yield Message(role="assistant", content="too late")
+
+        builder = EventDrivenWorkflow.Builder()
+        for node in [FailingNode(name="failing_node"), SlowNode(name="slow_node")]:
+            node.subscribed_expressions = [TopicExpr(topic=input_topic)]
+            node._subscribed_topics = {AGENT_INPUT_TOPIC: input_topic}
+            node.publish_to = [Topic(name=f"{node.name}_topic")]
+            builder.node(node)
+        workflow = builder.build()
+
+        with pytest.raises(ValueError, match="boom"):
+            await workflow.a_execute(
+                ExecutionContext(
+                    conversation_id="conversation_id",
+                    execution_id="execution_id",
+                    assistant_request_id=uuid.uuid4().hex,
+                ),
+                [Message(role="user", content="Hello")],
+            )
+
+        assert slow_node_cancelled.is_set()
+        await asyncio.sleep(0.3)
+        assert workflow.topics["slow_node_topic"].topic_events == []
+
+    def test_builder_keeps_order_of_independent_nodes(self):
+        """Test nodes that do not feed each other keep their registration order"""
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        builder = EventDrivenWorkflow.Builder()
+        for name in ["first_node", "second_node", "third_node"]:
+            node = MockNode(name=name)
+            node.subscribed_expressions = [TopicExpr(topic=input_topic)]
+            builder.node(node)
+
+        workflow = builder.build()
+
+        assert workflow._node_rank == {
+            "first_node": 0,
+            "second_node": 1,
+            "third_node": 2,
+        }
+
+    def test_builder_ranks_nodes_topologically(self):
+        """Test subscribers are ordered upstream first, even with cycles"""
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        middle_topic = Topic(name="middle_topic")
+        loop_topic = Topic(name="loop_topic")
+
+        def make_node(name, subscribed_topics, publish_to):
+            node = MockNode(name=name)
+            node.subscribed_expressions = [
+                TopicExpr(topic=topic) for topic in subscribed_topics
+            ]
+            node._subscribed_topics = {topic.name: topic for topic in subscribed_topics}
+            node.publish_to = publish_to
+            return node
+
+        workflow = (
+            EventDrivenWorkflow.Builder()
+            .node(make_node("loop_node", [middle_topic], [loop_topic]))
+            .node(make_node("second_node", [input_topic, middle_topic], []))
+            .node(make_node("first_node", [input_topic, loop_topic], [middle_topic]))
+            .build()
+        )
+
+        assert workflow._node_rank == {
+            "first_node": 0,
+            "loop_node": 1,
+            "second_node": 2,
+        }
+        assert list(workflow.nodes) == ["first_node", "loop_node", "second_node"]
+        assert workflow.topic_nodes[AGENT_INPUT_TOPIC] == ["first_node", "second_node"]
+        assert workflow.topic_nodes["middle_topic"] == ["loop_node", "second_node"]
+
+    def test_builder_ranks_entry_node_of_function_call_loop_first(self):
+        """Test the edge back into the agent input subscriber is the ignored one"""
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        function_call_topic = Topic(name="function_call_topic")
+        function_result_topic = Topic(name="function_result_topic")
+
+        llm_node = MockNode(name="llm_node")
+        llm_node.subscribed_expressions = [
+            TopicExpr(topic=input_topic),
+            TopicExpr(topic=function_result_topic),
+        ]
+        llm_node.publish_to = [function_call_topic]
+
+        function_call_node = MockNode(name="function_call_node")
+        function_call_node.subscribed_expressions = [
+            TopicExpr(topic=function_call_topic)
+        ]
+        function_call_node.publish_to = [function_result_topic]
+
+        workflow = (
+            EventDrivenWorkflow.Builder()
+            .node(llm_node)
+            .node(function_call_node)
+            .build()
+        )
+
+        assert workflow._node_rank == {"llm_node": 0, "function_call_node": 1}
+        assert list(workflow.nodes) == ["llm_node", "function_call_node"]
+        assert list(workflow.to_dict()["nodes"]) == ["llm_node", "function_call_node"]
+
+    def test_get_node_input_consumes_new_events_once(self, simple_workflow):
+        """Test node input only holds the events the node has not consumed yet"""
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        input_topic.publish_event_handler = simple_workflow.on_event
+        node = simple_workflow.nodes["test_node"]
+        node._subscribed_topics = {AGENT_INPUT_TOPIC: input_topic}
+        execution_context = ExecutionContext(
+            conversation_id="conversation_id",
+            execution_id="execution_id",
+            assistant_request_id="assistant_request_id",
+        )
+        event = input_topic.publish_data(
+            execution_context=execution_context,
+            publisher_name="test_publisher",
+            publisher_type="test_type",
+            data=[Message(role="user", content="Hello")],
+            consumed_events=[],
+        )
+
+        node_input = simple_workflow.get_node_input(node)
+
+        assert [(e.topic_name, e.offset, e.data) for e in node_input] == [
+            (AGENT_INPUT_TOPIC, 0, event.data)
+        ]
+        assert node_input[0].consumer_name == "test_node"
+        assert simple_workflow.get_node_input(node) == []
+
+    def test_initial_workflow_publishes_conversation_history(self, simple_workflow):
+        """Test previous assistant messages are published in timestamp order"""
+        container.event_store.clear_events()
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        input_topic.publish_event_handler = simple_workflow.on_event
+        simple_workflow.topics[AGENT_INPUT_TOPIC] = input_topic
+        execution_context = ExecutionContext(
+            conversation_id="conversation_id",
+            execution_id="execution_id",
+            assistant_request_id=uuid.uuid4().hex,
+        )
+
+        def make_message(content, timestamp):
+            return Message(role="user", content=content, timestamp=timestamp)
+
+        container.event_store.record_events(
+            [
+                AssistantRespondEvent(
+                    execution_context=execution_context.model_copy(
+                        update={"assistant_request_id": uuid.uuid4().hex}
+                    ),
+                    assistant_name="test_assistant",
+                    assistant_type="test_type",
+                    input_data=[make_message(input_content, input_timestamp)],
+                    output_data=[make_message(output_content, output_timestamp)],
+                )
+                for input_content, input_timestamp, output_content, output_timestamp in [
+                    ("third", 3, "fourth", 4),
+                    ("first", 1, "second", 2),
+                ]
+            ]
+        )
+
+        simple_workflow.initial_workflow(execution_context, [make_message("fifth", 5)])
+
+        assert [message.content for message in input_topic.topic_events[0].data] == [
+            "first",
+            "second",
+            "third",
+            "fourth",
+            "fifth",
+        ]
+
+    def test_builder_adds_function_specs_to_every_publishing_llm_node(self):
+        """Test all LLM nodes publishing to a function call topic get its specs"""
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        function_call_topic = Topic(name="function_call_topic")
+        function_spec = FunctionSpec(
+            name="get_weather",
+            description="Get the weather for a location",
+            parameters=ParametersSchema(
+                properties={"location": ParameterSchema(type="string")},
+                required=["location"],
+            ),
+        )
+
+        builder = EventDrivenWorkflow.Builder()
+        for name in ["first_llm_node", "second_llm_node"]:
+            llm_node = LLMNode(name=name)
+            llm_node.subscribed_expressions = [TopicExpr(topic=input_topic)]
+            llm_node._subscribed_topics = {AGENT_INPUT_TOPIC: input_topic}
+            llm_node.publish_to = [function_call_topic]
+            builder.node(llm_node)
+
+        function_call_node = LLMFunctionCallNode()
+        function_call_node.command = Mock(
+            get_function_specs=Mock(return_value=function_spec)
+        )
+        function_call_node.subscribed_expressions = [
+            TopicExpr(topic=function_call_topic)
+        ]
+        function_call_node._subscribed_topics = {
+            function_call_topic.name: function_call_topic
+        }
+        workflow = builder.node(function_call_node).build()
+
+        assert workflow.nodes["first_llm_node"].function_specs == [function_spec]
+        assert workflow.nodes["second_llm_node"].function_specs == [function_spec]
+
+    def test_to_dict_is_cached_until_workflow_changes(self):
+        """Test the serialized workflow is reused and rebuilt after a change"""
+        input_topic = Topic(name=AGENT_INPUT_TOPIC)
+        builder = EventDrivenWorkflow.Builder()
+        first_node = MockNode(name="first_node")
+        first_node.subscribed_expressions = [TopicExpr(topic=input_topic)]
+        workflow = builder.node(first_node).build()
+
+        workflow_dict = workflow.to_dict()
+        assert list(workflow_dict["nodes"]) == ["first_node"]
+
+        # Changing a returned dict does not change the cached workflow
+        workflow_dict["topic_nodes"][AGENT_INPUT_TOPIC].append("other_node")
+        assert workflow.to_dict()["topic_nodes"] == {AGENT_INPUT_TOPIC: ["first_node"]}
+        assert workflow.topic_nodes == {AGENT_INPUT_TOPIC: ["first_node"]}
+
+        builder.node(MockNode(name="second_node"))
+
+        assert list(workflow.to_dict()["nodes"]) == ["first_node", "second_node"]